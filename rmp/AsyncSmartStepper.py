@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+AsyncSmartStepper Module
+
+This module serves the SmartStepper web interface from an asyncio event loop
+instead of the blocking MicroPyServer accept loop. The request handlers are
+shared with SmartStepper; only the server underneath them changes.
+"""
+
+try:
+    import asyncio
+except ImportError:
+    # Older MicroPython firmware only ships uasyncio
+    import uasyncio as asyncio
+
+from rmp.SmartStepper import SmartStepper
+
+# Seconds an idle keep-alive connection is held open
+KEEP_ALIVE_TIMEOUT = 30
+
+# Largest request body accepted, and most header lines read per request
+MAX_BODY_SIZE = 4096
+MAX_HEADER_LINES = 32
+
+# Sent when no handler response can be produced; the connection is closed after
+_BAD_REQUEST_RESPONSE = b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+_SERVER_ERROR_RESPONSE = b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+_TOO_LARGE_RESPONSE = b"HTTP/1.1 413 Payload Too Large\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+
+class _RequestTooLarge(Exception):
+    """Raised when a request body exceeds MAX_BODY_SIZE."""
+
+
+class AsyncServer:
+    """Minimal asyncio HTTP server exposing the MicroPyServer route/send interface."""
+
+    def __init__(self, host="0.0.0.0", port=80, keep_alive_timeout=KEEP_ALIVE_TIMEOUT):
+        """Initialize the server without binding a socket."""
+        self._host = host
+        self._port = port
+        self._keep_alive_timeout = keep_alive_timeout
+        self._routes = []
+        self._out = []
+        self._server = None
+
+    def add_route(self, path, handler, method="GET"):
+        """Register a handler for the given path and HTTP method."""
+        self._routes.append({"path": path, "handler": handler, "method": method})
+
+    def find_route(self, method, path):
+        """Return the route registered for method and path, or None."""
+        for route in self._routes:
+            if route["method"] == method and route["path"] == path:
+                return route
+        return None
+
+    def send(self, data):
+        """Queue response data for the request currently being handled."""
+        self._out.append(data)
+
+    async def _read_request(self, reader):
+        """Read one HTTP request, framed by its Content-Length header.
+        
+        Returns (request, keep_alive), or (None, False) once the client
+        has closed the connection. Raises ValueError for a malformed
+        request (including invalid UTF-8) and _RequestTooLarge when the
+        body exceeds MAX_BODY_SIZE.
+        """
+        request_line = await reader.readline()
+        if not request_line:
+            return None, False
+
+        head = [request_line]
+        length = 0
+        keep_alive = True
+        while True:
+            line = await reader.readline()
+            if not line or line == b"\r\n":
+                break
+            head.append(line)
+            if len(head) > MAX_HEADER_LINES:
+                raise ValueError("too many header lines")
+            name = line[:16].lower()
+            if name.startswith(b"content-length:"):
+                length = int(line[15:].strip())
+                if length < 0:
+                    raise ValueError("negative Content-Length")
+                if length > MAX_BODY_SIZE:
+                    raise _RequestTooLarge()
+            elif name.startswith(b"connection:"):
+                keep_alive = line[11:].strip().lower() != b"close"
+
+        body = await reader.readexactly(length) if length else b""
+        return b"".join(head).decode() + "\r\n" + body.decode(), keep_alive
+
+    def _dispatch(self, request):
+        """Run the route handler for request and return the encoded response.
+        
+        Returns (response, ok). ok is False when the request line is
+        malformed or the handler produced no response, and the caller
+        must close the connection after sending the error response.
+        """
+        parts = request.split("\r\n", 1)[0].split(" ")
+        if len(parts) != 3:
+            return _BAD_REQUEST_RESPONSE, False
+        
+        # Handlers run synchronously, so nothing else touches _out meanwhile
+        out = self._out = []
+        try:
+            route = self.find_route(parts[0], parts[1].split("?", 1)[0])
+            if route:
+                route["handler"](request)
+            else:
+                self.send("HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+        except Exception as e:
+            print(f"Error dispatching request: {e}")
+            out = self._out = []
+        
+        if not out:
+            return _SERVER_ERROR_RESPONSE, False
+        
+        return "".join(out).encode(), True
+
+    async def _handle_connection(self, reader, writer):
+        """Serve requests on an accepted connection until it closes or idles out."""
+        try:
+            while True:
+                try:
+                    request, keep_alive = await asyncio.wait_for(
+                        self._read_request(reader), self._keep_alive_timeout)
+                except _RequestTooLarge:
+                    writer.write(_TOO_LARGE_RESPONSE)
+                    await writer.drain()
+                    break
+                except ValueError:
+                    # Also covers UnicodeError from undecodable requests
+                    writer.write(_BAD_REQUEST_RESPONSE)
+                    await writer.drain()
+                    break
+                if not request:
+                    break
+                response, ok = self._dispatch(request)
+                writer.write(response)
+                await writer.drain()
+                if not (ok and keep_alive):
+                    break
+        except asyncio.TimeoutError:
+            pass
+        except Exception as e:
+            print(f"Error handling connection: {e}")
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception as e:
+                print(f"Error closing connection: {e}")
+
+    async def serve(self):
+        """Accept connections until the server is stopped."""
+        self._server = await asyncio.start_server(self._handle_connection, self._host, self._port)
+        await self._server.wait_closed()
+
+    def start(self):
+        """Run the event loop serving requests."""
+        asyncio.run(self.serve())
+
+    def stop(self):
+        """Stop accepting connections."""
+        if self._server:
+            self._server.close()
+
+
+class AsyncSmartStepper(SmartStepper):
+    """SmartStepper controller served from an asyncio event loop."""
+    
+    # AsyncServer keeps connections open between requests
+    CONNECTION_HEADER = "Connection: keep-alive\r\nKeep-Alive: timeout=%d\r\n" % KEEP_ALIVE_TIMEOUT
+
+    def _create_server(self, host, port):
+        """Create the asyncio server used in place of MicroPyServer."""
+        return AsyncServer(host=host, port=port)
+
+
+def main():
+    """Main function to run AsyncSmartStepper."""
+    try:
+        stepper = AsyncSmartStepper()
+        stepper.start()
+    except KeyboardInterrupt:
+        print("\nShutting down AsyncSmartStepper...")
+        try:
+            stepper.stop()
+        except Exception as e:
+            print(f"Error during shutdown: {e}")
+    except Exception as e:
+        print(f"Error in main: {e}")
+        import sys
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,7 @@ from rmp.SmartStepper import SmartStepper
 class SmartServo42(SmartStepper):
     """SmartServo42 controller with web interface, inheriting from SmartStepper."""
     
-    def __init__(self, host="0.0.0.0", port=8080, config_file="servo42_config.json"):
-        """Initialize SmartServo42 with servo-specific configuration."""
-        # Call parent constructor with servo config file
-        super().__init__(host=host, port=port, config_file=config_file)
+    DEFAULT_CONFIG_FILE = "config_servo42.json"
 
 
 def main():
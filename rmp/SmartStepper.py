@@ -10,7 +10,13 @@ import json
 import sys
 import wifi
 import gc
-from rmp.MotorControl.stepperDriver import StepperDriver
+import time
+
+try:
+    import _thread
+except ImportError:
+    # Not every MicroPython port is built with thread support
+    _thread = None
 
 # MicroPython 1.25+ compatible imports
 try:
@@ -25,26 +31,42 @@ except ImportError:
 try:
     print("Motor Control")
     from rmp.MotorControl.MotorControl import MotorController, MotorType
+    from rmp.MotorControl.stepperDriver import StepperDriver
     print("MicroPyServer")
     from rmp.MicroPyServer.micropyserver import MicroPyServer
-    print("utils")
-    from rmp.MicroPyServer.utils import *
+    from rmp._config import load_config, DEFAULT_CONFIG
 except ImportError as e:
     print(e)
-    # Fallback for different import paths
+    # Fallback for when the rmp directory itself is the import root
     try:
-        from MotorControl import MotorController, MotorType
-        from MicroPyServer import MicroPyServer
-        from rmp.MicroPyServer.utils import *
-
+        from MotorControl.MotorControl import MotorController, MotorType
+        from MotorControl.stepperDriver import StepperDriver
+        from MicroPyServer.micropyserver import MicroPyServer
+        from _config import load_config, DEFAULT_CONFIG
     except ImportError:
         print("Error: Could not import MotorControl or MicroPyServer modules")
         sys.exit(1)
 
+# Directory of this module, where the config files live (MicroPython has no os.path)
+_MODULE_DIR = __file__.rsplit('/', 1)[0] if '/' in __file__ else '.'
+
 
 class SmartStepper:
     """SmartStepper controller with web interface."""
     
+    # Config file loaded when no config_file is passed to the constructor
+    DEFAULT_CONFIG_FILE = "config.json"
+    
+    # MicroPyServer closes the socket after every response
+    CONNECTION_HEADER = "Connection: close\r\n"
+    
+    # Pending motor commands accepted before /control reports the queue full
+    MAX_QUEUED_COMMANDS = 16
+    # Command results kept for /result
+    MAX_RESULTS = 32
+    # Seconds stop() waits for the current move before shutting the motor down
+    STOP_TIMEOUT = 1
+    
     def __init__(self, host="0.0.0.0", port=8080, config_file=None):
         """Initialize SmartStepper with web server."""
         try:
@@ -58,7 +80,46 @@ class SmartStepper:
            
             
             self.config = self._load_config(config_file)
-            self.server = MicroPyServer()
+            self._layout_response = self._build_layout_response()
+            
+            # Responses with constant payloads are serialized once
+            self._not_initialized_response = self._build_error_response(
+                "Motor not initialized. Please initialize first.")
+            self._status_not_initialized_response = self._build_response(json.dumps({
+                "status": "not_initialized",
+                "message": "Motor not initialized"
+            }))
+            self._invalid_json_response = self._build_error_response("Invalid JSON in request body")
+            self._queue_full_response = self._build_error_response("Motor command queue is full")
+            self._internal_error_response = self._build_error_response("Internal server error")
+            
+            # Motor defaults never change at runtime, resolve them once
+            motor_config = self.config.get('motor', {})
+            self._default_pins = motor_config.get('default_pins', {})
+            self._default_settings = motor_config.get('default_settings', {})
+            self._stepper_type = MotorType.STEPPER
+            
+            web_config = self.config.get('web_interface', {})
+            speed_range = web_config.get('speed_range', {})
+            steps_range = web_config.get('steps_range', {})
+            self._speed_range = (speed_range.get('min', 0), speed_range.get('max', 1000))
+            self._steps_range = (steps_range.get('min', 1), steps_range.get('max', 10000))
+            
+            # Motor commands are queued and run by a worker thread when available
+            self._cmd_queue = []
+            self._results = {}
+            self._next_cmd_id = 1
+            self._cmd_lock = _thread.allocate_lock() if _thread else None
+            self._worker_running = self._cmd_lock is not None
+            if self._worker_running:
+                # Held while the queue is idle; released to wake the worker
+                self._cmd_ready = _thread.allocate_lock()
+                self._cmd_ready.acquire()
+                # Held until the worker thread exits
+                self._worker_alive = _thread.allocate_lock()
+                self._worker_alive.acquire()
+            
+            self.server = self._create_server(host, port)
             self.motor_controller = MotorController()
             self.stepper_motor = None
             print("Register")
@@ -69,25 +130,33 @@ class SmartStepper:
             print(self.initialize_motor())
 
             self.setup_routes()
+            
+            if self._worker_running:
+                _thread.start_new_thread(self._motor_worker, ())
 
         except Exception as e:
             print(f"Error initializing SmartStepper: {e}")
             raise
     
+    def _create_server(self, host, port):
+        """Create the HTTP server that routes are registered on."""
+        return MicroPyServer()
+    
     def _load_config(self, config_file=None):
         """Load configuration from JSON file."""
         if config_file is None:
-            # Try common config file locations
+            # Try next to this module first, then common locations
+            name = type(self).DEFAULT_CONFIG_FILE
             config_locations = [
-                'config.json',
-                '../config.json',
-                'rmp/config.json'
+                _MODULE_DIR + '/' + name,
+                name,
+                '../' + name,
+                'rmp/' + name
             ]
             
             for location in config_locations:
                 try:
-                    with open(location, 'r') as f:
-                        return json.load(f)
+                    return load_config(location)
                 except Exception:
                     continue
             
@@ -96,42 +165,83 @@ class SmartStepper:
         # Try to load the specified config file
         if config_file:
             try:
-                with open(config_file, 'r') as f:
-                    return json.load(f)
+                return load_config(config_file)
             except Exception as e:
                 print(f"Warning: Could not load config file {config_file}: {e}")
         
-        # Default configuration
-        return {
-            "server": {
-                "host": "0.0.0.0",
-                "port": 80
-            },
-            "motor": {
-                "default_pins": {
-                    "step_pin": 18,
-                    "dir_pin": 19,
-                    "enable_pin": 20
+        return DEFAULT_CONFIG
+    
+    def _build_layout_response(self):
+        """Build the layout response once; it only depends on the loaded config."""
+        web_config = self.config.get('web_interface', {})
+        motor_config = self.config.get('motor', {})
+        
+        layout = {
+            "title": web_config.get('title', 'SmartStepper Control'),
+            "description": web_config.get('description', 'Control your stepper motor with direction and speed settings'),
+            "submitUrl": "/control",
+            "elements": [
+                {
+                    "id": "direction",
+                    "type": "select",
+                    "label": "Direction",
+                    "options": [
+                        {"value": "forward", "label": "Forward"},
+                        {"value": "backward", "label": "Backward"}
+                    ],
+                    "defaultValue": "forward",
+                    "required": True
+                },
+                {
+                    "id": "speed",
+                    "type": "input",
+                    "inputType": "number",
+                    "label": "Speed (RPM)",
+                    "placeholder": "Enter speed in RPM",
+                    "min": web_config.get('speed_range', {}).get('min', 0),
+                    "max": web_config.get('speed_range', {}).get('max', 1000),
+                    "defaultValue": str(motor_config.get('default_settings', {}).get('default_speed', 60)),
+                    "required": True
+                },
+                {
+                    "id": "steps",
+                    "type": "input",
+                    "inputType": "number",
+                    "label": "Steps",
+                    "placeholder": "Number of steps to move",
+                    "min": web_config.get('steps_range', {}).get('min', 1),
+                    "max": web_config.get('steps_range', {}).get('max', 10000),
+                    "defaultValue": str(motor_config.get('default_settings', {}).get('default_steps', 200)),
+                    "required": True
                 },
-                "default_settings": {
-                    "microsteps": 1,
-                    "default_speed": 60,
-                    "default_steps": 200
+                {
+                    "id": "submit",
+                    "type": "button",
+                    "label": "Move Motor",
+                    "action": "submit",
+                    "style": "primary"
+                },
+                {
+                    "id": "stop",
+                    "type": "button",
+                    "label": "Stop Motor",
+                    "action": "custom",
+                    "style": "danger"
                 }
-            },
-            "web_interface": {
-                "title": "SmartStepper Control",
-                "description": "Control your stepper motor with direction and speed settings",
-                "speed_range": {
-                    "min": 0,
-                    "max": 1000
+            ],
+            "outputMappings": [
+                {
+                    "elementId": "status",
+                    "responseKey": "status"
                 },
-                "steps_range": {
-                    "min": 1,
-                    "max": 10000
+                {
+                    "elementId": "message",
+                    "responseKey": "message"
                 }
-            }
+            ]
         }
+        
+        return self._build_response(json.dumps(layout))
     
     def setup_routes(self):
         """Setup HTTP routes for the web interface."""
@@ -152,6 +262,9 @@ class SmartStepper:
             self.server.add_route("/control", self.control_motor, "POST")
             self.server.add_route("/control", self.optionsRequest, "OPTIONS" )
 
+            # Get the outcome of a queued motor command
+            self.server.add_route("/result", self.get_result, "GET")
+            
             # Get motor status
             self.server.add_route("/status", self.get_status, "GET")
             
@@ -162,93 +275,19 @@ class SmartStepper:
             raise
         
     def optionsRequest(self, request):
-        
+        """Answer CORS preflight requests."""
         print("Options Request")
-        # Define CORS headers
-        cors_headers = {
-            "Access-Control-Allow-Origin: *",  # Or specific origin, e.g., "http://example.com"
-            "Access-Control-Allow-Methods: GET, POST, OPTIONS",
-            "Access-Control-Allow-Headers: Content-Type, Authorization"
-        }
-        send_response(self.server, "", http_code=200, content_type="text/html", extend_headers=cors_headers)
+        self.server.send(self._build_response("", content_type="text/html"))
 
   
     def get_layout(self, request):
         """Return the JSON layout for the web form."""
         print("Get Layout")
         try:
-            web_config = self.config.get('web_interface', {})
-            motor_config = self.config.get('motor', {})
-            
-            layout = {
-                "title": web_config.get('title', 'SmartStepper Control'),
-                "description": web_config.get('description', 'Control your stepper motor with direction and speed settings'),
-                "submitUrl": "/control",
-                "elements": [
-                    {
-                        "id": "direction",
-                        "type": "select",
-                        "label": "Direction",
-                        "options": [
-                            {"value": "forward", "label": "Forward"},
-                            {"value": "backward", "label": "Backward"}
-                        ],
-                        "defaultValue": "forward",
-                        "required": True
-                    },
-                    {
-                        "id": "speed",
-                        "type": "input",
-                        "inputType": "number",
-                        "label": "Speed (RPM)",
-                        "placeholder": "Enter speed in RPM",
-                        "min": web_config.get('speed_range', {}).get('min', 0),
-                        "max": web_config.get('speed_range', {}).get('max', 1000),
-                        "defaultValue": str(motor_config.get('default_settings', {}).get('default_speed', 60)),
-                        "required": True
-                    },
-                    {
-                        "id": "steps",
-                        "type": "input",
-                        "inputType": "number",
-                        "label": "Steps",
-                        "placeholder": "Number of steps to move",
-                        "min": web_config.get('steps_range', {}).get('min', 1),
-                        "max": web_config.get('steps_range', {}).get('max', 10000),
-                        "defaultValue": str(motor_config.get('default_settings', {}).get('default_steps', 200)),
-                        "required": True
-                    },
-                    {
-                        "id": "submit",
-                        "type": "button",
-                        "label": "Move Motor",
-                        "action": "submit",
-                        "style": "primary"
-                    },
-                    {
-                        "id": "stop",
-                        "type": "button",
-                        "label": "Stop Motor",
-                        "action": "custom",
-                        "style": "danger"
-                    }
-                ],
-                "outputMappings": [
-                    {
-                        "elementId": "status",
-                        "responseKey": "status"
-                    },
-                    {
-                        "elementId": "message",
-                        "responseKey": "message"
-                    }
-                ]
-            }
-            
-            self._send_json_response(layout)
+            self.server.send(self._layout_response)
         except Exception as e:
             print(f"Error in get_layout: {e}")
-            self._send_error_response("Internal server error")
+            self._send_internal_error()
     
     def control_motor(self, request):
         """Handle motor control commands."""
@@ -262,9 +301,9 @@ class SmartStepper:
             if body:
                 try:
                     data = json.loads(body)
-                except json.JSONDecodeError as e:
+                except ValueError as e:
                     print(f"Error parsing JSON: {e}")
-                    self._send_error_response("Invalid JSON in request body")
+                    self.server.send(self._invalid_json_response)
                     return
             direction = data.get('direction', 'forward')
             try:
@@ -277,92 +316,217 @@ class SmartStepper:
             except (ValueError, TypeError):
                 steps = 200
             
+            # Reject out-of-range requests before they reach the motor driver
+            speed_min, speed_max = self._speed_range
+            if not speed_min <= speed <= speed_max:
+                self._send_error_response(f"Speed must be between {speed_min} and {speed_max} RPM")
+                return
+            
+            steps_min, steps_max = self._steps_range
+            if not steps_min <= steps <= steps_max:
+                self._send_error_response(f"Steps must be between {steps_min} and {steps_max}")
+                return
+            
+            if isinstance(direction, str):
+                direction = direction.lower()
+            if direction not in ('forward', 'backward'):
+                self._send_error_response("Direction must be 'forward' or 'backward'")
+                return
+            
             if not self.stepper_motor:
-                response = {
-                    "status": "error",
-                    "message": "Motor not initialized. Please initialize first."
-                }
+                self.server.send(self._not_initialized_response)
+                return
+            
+            if self._cmd_lock is None:
+                # No thread support on this port, move the motor inline
+                response = self._run_motor_command(speed, steps, direction)
             else:
-                # Set direction (True for forward, False for backward)
-                motor_direction = direction.lower() == 'forward'
-                
-                # Set speed
-                try:
-                    self.stepper_motor.set_speed(speed)
-                except Exception as e:
-                    print(f"Error setting speed: {e}")
-                    response = {
-                        "status": "error",
-                        "message": f"Failed to set speed: {str(e)}"
-                    }
-                    self._send_json_response(response)
+                cmd_id = self._queue_command(self._run_motor_command, (speed, steps, direction))
+                if cmd_id is None:
+                    self.server.send(self._queue_full_response)
                     return
                 
-                # Move motor
+                response = {
+                    "status": "queued",
+                    "id": cmd_id,
+                    "message": f"Queued {steps} steps {direction} at {speed} RPM"
+                }
+                self._send_json_response(response, "202 Accepted")
+                return
+            
+            self._send_json_response(response)
+            
+        except Exception as e:
+            print(f"Error in control_motor: {e}")
+            self._send_error_response(f"Error controlling motor: {str(e)}")
+    
+    def _run_motor_command(self, speed, steps, direction):
+        """Set the speed and move the motor, returning the response dict."""
+        # Set direction (True for forward, False for backward);
+        # control_motor has already lowercased and validated it
+        motor_direction = direction == 'forward'
+        
+        # Set speed
+        try:
+            self.stepper_motor.set_speed(speed)
+        except Exception as e:
+            print(f"Error setting speed: {e}")
+            return {
+                "status": "error",
+                "message": f"Failed to set speed: {str(e)}"
+            }
+        
+        # Move motor
+        try:
+            success = self.stepper_motor.move_steps(steps, motor_direction)
+        except Exception as e:
+            print(f"Error moving motor: {e}")
+            return {
+                "status": "error",
+                "message": f"Failed to move motor: {str(e)}"
+            }
+        
+        if not success:
+            return {
+                "status": "error",
+                "message": "Failed to move motor"
+            }
+        
+        try:
+            position = self.stepper_motor.get_stepper_position()
+        except Exception as e:
+            print(f"Error getting position: {e}")
+            position = 0
+        
+        return {
+            "status": "success",
+            "message": f"Motor moved {steps} steps {direction} at {speed} RPM",
+            "position": position
+        }
+    
+    def _queue_command(self, func, args):
+        """Queue func(*args) for the motor worker.
+        
+        Returns the command id, or None when the queue is full.
+        """
+        with self._cmd_lock:
+            if len(self._cmd_queue) >= self.MAX_QUEUED_COMMANDS:
+                return None
+            
+            cmd_id = self._next_cmd_id
+            self._next_cmd_id += 1
+            self._cmd_queue.append((cmd_id, func, args))
+            self._store_result(cmd_id, {"status": "pending", "id": cmd_id})
+            self._wake_worker()
+            return cmd_id
+    
+    def _store_result(self, cmd_id, result):
+        """Record a command result, dropping the oldest finished one when full.
+        
+        Must be called with _cmd_lock held.
+        """
+        self._results[cmd_id] = result
+        if len(self._results) > self.MAX_RESULTS:
+            for old_id in sorted(self._results):
+                if self._results[old_id].get("status") != "pending":
+                    del self._results[old_id]
+                    break
+    
+    def _wake_worker(self):
+        """Wake the motor worker if it is waiting for commands.
+        
+        Must be called with _cmd_lock held.
+        """
+        if self._cmd_ready.locked():
+            self._cmd_ready.release()
+    
+    def _motor_worker(self):
+        """Run queued motor commands so HTTP handlers never wait on the motor."""
+        try:
+            self._process_commands()
+        finally:
+            self._worker_alive.release()
+    
+    def _process_commands(self):
+        """Run queued motor commands until the worker is stopped."""
+        while self._worker_running:
+            # Blocks until _wake_worker releases the lock
+            self._cmd_ready.acquire()
+            
+            while self._worker_running:
+                with self._cmd_lock:
+                    cmd = self._cmd_queue.pop(0) if self._cmd_queue else None
+                if cmd is None:
+                    break
+                
+                cmd_id, func, args = cmd
                 try:
-                    success = self.stepper_motor.move_steps(steps, motor_direction)
+                    result = func(*args)
                 except Exception as e:
-                    print(f"Error moving motor: {e}")
-                    response = {
+                    print(f"Error in motor worker: {e}")
+                    result = {
                         "status": "error",
-                        "message": f"Failed to move motor: {str(e)}"
+                        "message": f"Error controlling motor: {str(e)}"
                     }
-                    self._send_json_response(response)
-                    return
+                result["id"] = cmd_id
                 
-                if success:
-                    try:
-                        position = self.stepper_motor.get_stepper_position()
-                    except Exception as e:
-                        print(f"Error getting position: {e}")
-                        position = 0
-                    
-                    response = {
-                        "status": "success",
-                        "message": f"Motor moved {steps} steps {direction} at {speed} RPM",
-                        "position": position
-                    }
-                else:
-                    response = {
-                        "status": "error",
-                        "message": "Failed to move motor"
-                    }
-            
-            self._send_json_response(response)
+                with self._cmd_lock:
+                    self._store_result(cmd_id, result)
+    
+    def _wait_for_worker(self, timeout):
+        """Wait up to timeout seconds for the worker thread to exit."""
+        for _ in range(int(timeout * 20)):
+            if self._worker_alive.acquire(0):
+                return True
+            time.sleep(0.05)
+        return False
+    
+    def get_result(self, request):
+        """Return the outcome of a queued motor command (GET /result?id=N)."""
+        try:
+            try:
+                cmd_id = int(self._get_query_param(request, "id"))
+            except (ValueError, TypeError):
+                self._send_error_response("Missing or invalid command id")
+                return
             
+            # A single dict lookup needs no lock
+            result = self._results.get(cmd_id)
+            if result is None:
+                self._send_error_response(f"Unknown command id {cmd_id}")
+            else:
+                self._send_json_response(result)
         except Exception as e:
-            print(f"Error in control_motor: {e}")
-            self._send_error_response(f"Error controlling motor: {str(e)}")
+            print(f"Error in get_result: {e}")
+            self._send_internal_error()
     
     def get_status(self, request):
         """Get current motor status."""
         try:
             if not self.stepper_motor:
+                self.server.send(self._status_not_initialized_response)
+                return
+            
+            try:
+                motor_status = self.stepper_motor.get_status()
                 status = {
-                    "status": "not_initialized",
-                    "message": "Motor not initialized"
+                    "status": "initialized",
+                    "message": "Motor is ready",
+                    "position": motor_status.get("position", 0),
+                    "speed": motor_status.get("speed", 0),
+                    "initialized": motor_status.get("initialized", False)
+                }
+            except Exception as e:
+                print(f"Error getting motor status: {e}")
+                status = {
+                    "status": "error",
+                    "message": f"Error getting motor status: {str(e)}"
                 }
-            else:
-                try:
-                    motor_status = self.stepper_motor.get_status()
-                    status = {
-                        "status": "initialized",
-                        "message": "Motor is ready",
-                        "position": motor_status.get("position", 0),
-                        "speed": motor_status.get("speed", 0),
-                        "initialized": motor_status.get("initialized", False)
-                    }
-                except Exception as e:
-                    print(f"Error getting motor status: {e}")
-                    status = {
-                        "status": "error",
-                        "message": f"Error getting motor status: {str(e)}"
-                    }
             
             self._send_json_response(status)
         except Exception as e:
             print(f"Error in get_status: {e}")
-            self._send_error_response("Internal server error")
+            self._send_internal_error()
     
     def initialize_motor_from_api(self, request):
         # Parse request body
@@ -372,21 +536,35 @@ class SmartStepper:
         if body:
             try:
                 data = json.loads(body)
-            except json.JSONDecodeError as e:
+            except ValueError as e:
                 print(f"Error parsing JSON: {e}")
-                self._send_error_response("Invalid JSON in request body")
+                self.server.send(self._invalid_json_response)
                 return
-        response = self.initialize_motor(data)
-        self._send_json_response(response)
+        
+        if self._cmd_lock is None:
+            # No thread support on this port, initialize inline
+            self._send_json_response(self.initialize_motor(data))
+            return
+        
+        # Run after any queued moves so the handler never waits on the motor
+        cmd_id = self._queue_command(self.initialize_motor, (data,))
+        if cmd_id is None:
+            self.server.send(self._queue_full_response)
+            return
+        
+        response = {
+            "status": "queued",
+            "id": cmd_id,
+            "message": "Queued motor initialization"
+        }
+        self._send_json_response(response, "202 Accepted")
 
     def initialize_motor(self, data={}):
         """Initialize the stepper motor."""
         print("Init Motor")
         try:
-            
-            # Get default pins from config
-            default_pins = self.config.get('motor', {}).get('default_pins', {})
-            default_settings = self.config.get('motor', {}).get('default_settings', {})
+            default_pins = self._default_pins
+            default_settings = self._default_settings
             
             # Use request data or fall back to config defaults
             try:
@@ -415,7 +593,7 @@ class SmartStepper:
             try:
                 self.stepper_motor = self.motor_controller.create_motor(
                     "smart_stepper",
-                    MotorType.STEPPER,
+                    self._stepper_type,
                     "stepper_driver",
                     step_pin=step_pin,
                     dir_pin=dir_pin,
@@ -424,11 +602,10 @@ class SmartStepper:
                 )
             except Exception as e:
                 print(f"Error creating motor: {e}")
-                response = {
+                return {
                     "status": "error",
                     "message": f"Failed to create motor: {str(e)}"
                 }
-                return
             
             # Initialize the motor
             try:
@@ -439,7 +616,6 @@ class SmartStepper:
                     "status": "error",
                     "message": f"Failed to initialize motor: {str(e)}"
                 }
-
             
             if success:
                 return {
@@ -463,44 +639,64 @@ class SmartStepper:
     def _get_request_body(self, request):
         """Extract request body from HTTP request."""
         try:
-            lines = request.split('\r\n')
-            body_start = False
-            body = ""
-            
-            for line in lines:
-                if body_start:
-                    body += line
-                elif line == "":
-                    body_start = True
-            
-            return body
+            idx = request.find("\r\n\r\n")
+            return "" if idx < 0 else request[idx + 4:]
         except Exception as e:
             print(f"Error parsing request body: {e}")
             return ""
     
-    def _send_json_response(self, data):
-        """Send JSON response to client."""
+    def _get_query_param(self, request, name):
+        """Return a query string parameter from the request line, or None."""
+        parts = request.split("\r\n", 1)[0].split(" ")
+        if len(parts) < 2 or "?" not in parts[1]:
+            return None
+        
+        for pair in parts[1].split("?", 1)[1].split("&"):
+            key_value = pair.split("=", 1)
+            if key_value[0] == name:
+                return key_value[1] if len(key_value) > 1 else ""
+        return None
+    
+    def _build_response(self, body, status="200 OK", content_type="application/json"):
+        """Build a complete HTTP response (status line, headers and body) as one string."""
+        return (
+            "HTTP/1.1 %s\r\n"
+            "Content-Type: %s\r\n"
+            "Content-Length: %d\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+            "Access-Control-Allow-Headers: Content-Type, Authorization\r\n"
+            "%s"
+            "\r\n"
+            "%s"
+        ) % (status, content_type, len(body.encode()), self.CONNECTION_HEADER, body)
+    
+    def _send_json_response(self, data, status="200 OK"):
+        """Send JSON response to client in a single write."""
         try:
-            response = json.dumps(data)
-            self.server.send("HTTP/1.1 200 OK\r\n")
-            self.server.send("Content-Type: application/json\r\n")
-            self.server.send("Access-Control-Allow-Origin: *\r\n")
-            self.server.send("Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n")
-            self.server.send("Access-Control-Allow-Headers: Content-Type\r\n")
-            self.server.send("\r\n")
-            self.server.send(response)
+            self.server.send(self._build_response(json.dumps(data), status))
         except Exception as e:
             print(f"Error sending JSON response: {e}")
-            self._send_error_response("Internal server error")
+            self._send_internal_error()
+    
+    def _build_error_response(self, message):
+        """Build a complete error response for message."""
+        return self._build_response(json.dumps({
+            "status": "error",
+            "message": message
+        }))
+    
+    def _send_internal_error(self):
+        """Send the precomputed internal server error response."""
+        try:
+            self.server.send(self._internal_error_response)
+        except Exception as e:
+            print(f"Error sending error response: {e}")
     
     def _send_error_response(self, message):
         """Send error response to client."""
         try:
-            response = {
-                "status": "error",
-                "message": message
-            }
-            self._send_json_response(response)
+            self.server.send(self._build_error_response(message))
         except Exception as e:
             print(f"Error sending error response: {e}")
     
@@ -513,6 +709,7 @@ class SmartStepper:
             print("  GET  /api/layout    - Get form layout")
             print("  POST /api/init      - Initialize motor")
             print("  POST /api/control   - Control motor")
+            print("  GET  /api/result    - Get queued command result")
             print("  GET  /api/status    - Get motor status")
             self.server.start()
         except Exception as e:
@@ -522,6 +719,26 @@ class SmartStepper:
     def stop(self):
         """Stop the SmartStepper web server."""
         try:
+            if self._worker_running:
+                with self._cmd_lock:
+                    self._worker_running = False
+                    for cmd in self._cmd_queue:
+                        self._store_result(cmd[0], {
+                            "status": "cancelled",
+                            "id": cmd[0],
+                            "message": "Cancelled by shutdown"
+                        })
+                    self._cmd_queue.clear()
+                    self._wake_worker()
+                
+                # Give the current move a moment to finish; after that the
+                # shutdown below is what stops it
+                try:
+                    if not self._wait_for_worker(self.STOP_TIMEOUT):
+                        print("Motor worker still busy, shutting down anyway")
+                except KeyboardInterrupt:
+                    pass
+            
             if self.stepper_motor:
                 try:
                     self.stepper_motor.shutdown()
@@ -0,0 +1,63 @@
+"""
+Config loading shared by SmartStepper and its variants.
+
+Parsed config files are cached by path and modification time, so creating
+several controllers in one process parses each file only once. Returned
+dicts are shared between callers and must be treated as read-only.
+"""
+
+import json
+import os
+
+# Number of (path, mtime) entries kept before the cache is reset
+_CACHE_SIZE = 8
+_cache = {}
+
+# Configuration used when no config file can be loaded
+DEFAULT_CONFIG = {
+    "server": {
+        "host": "0.0.0.0",
+        "port": 80
+    },
+    "motor": {
+        "default_pins": {
+            "step_pin": 18,
+            "dir_pin": 19,
+            "enable_pin": 20
+        },
+        "default_settings": {
+            "microsteps": 1,
+            "default_speed": 60,
+            "default_steps": 200
+        }
+    },
+    "web_interface": {
+        "title": "SmartStepper Control",
+        "description": "Control your stepper motor with direction and speed settings",
+        "speed_range": {
+            "min": 0,
+            "max": 1000
+        },
+        "steps_range": {
+            "min": 1,
+            "max": 10000
+        }
+    }
+}
+
+
+def load_config(path):
+    """Load a JSON config file, reusing the parsed result while it is unchanged.
+
+    Raises OSError if the file does not exist and ValueError if it is not valid JSON.
+    """
+    # os.stat returns a tuple on MicroPython; index 8 is st_mtime on both
+    key = (path, os.stat(path)[8])
+    config = _cache.get(key)
+    if config is None:
+        with open(path, 'r') as f:
+            config = json.load(f)
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.clear()
+        _cache[key] = config
+    return config